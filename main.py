@@ -1,27 +1,39 @@
 import os
-import json
+import orjson
 import csv
 import asyncio
+import base64
+import functools
+import gzip
+import hashlib
+import math
+import mimetypes
 import re
-from io import BytesIO
-from io import StringIO
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, cast
-from fastapi import FastAPI, HTTPException, Request, Response
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple, cast
+from urllib.parse import quote
+import httpx
+from fastapi import BackgroundTasks, Depends, FastAPI, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, ORJSONResponse, RedirectResponse, StreamingResponse
 from pydantic import BaseModel
+from starlette.background import BackgroundTask
+from cachetools import LRUCache, TTLCache
 try:
-    from groq import Groq
+    from groq import AsyncGroq, RateLimitError as _GroqRateLimitError
+    RateLimitError: type[Exception] = _GroqRateLimitError
 except Exception:
-    Groq = None  # type: ignore[assignment]
+    AsyncGroq = None  # type: ignore[assignment,misc]
+
+    class _MissingGroqRateLimitError(Exception):
+        pass
+    RateLimitError = _MissingGroqRateLimitError
 from dotenv import load_dotenv
-from pyairtable import Api
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
 from reportlab.pdfgen import canvas
 
 load_dotenv()
@@ -32,35 +44,238 @@ GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
 AIRTABLE_API_KEY = os.getenv("AIRTABLE_API_KEY")
 AIRTABLE_BASE_ID = os.getenv("AIRTABLE_BASE_ID")
 AIRTABLE_TABLE_NAME = os.getenv("AIRTABLE_TABLE_NAME", "ResearchSessions")
+# Optional attachment field; when set, finalized sessions get their PDF uploaded there.
+AIRTABLE_PDF_FIELD = os.getenv("AIRTABLE_PDF_FIELD", "").strip()
 DEFAULT_USER_ID = os.getenv("API_DEFAULT_USER_ID", "local-dev")
 TOKENS_RAW = os.getenv("API_TOKENS_JSON", "")
 ALLOWED_ORIGINS_RAW = os.getenv("ALLOWED_ORIGINS", "http://localhost:5173,http://127.0.0.1:5173")
 ENABLE_FALLBACK_ON_QUOTA = os.getenv("ENABLE_FALLBACK_ON_QUOTA", "true").lower() == "true"
+REFINE_DATA_SYNC_EVERY = 5
+REFINE_DATA_FLUSH_SECONDS = 60.0
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "86400"))
+LLM_CACHE_MAX = int(os.getenv("LLM_CACHE_MAX", "10000"))
+# Longest a request may queue in the rate limiter. Keep it well under the frontend's 30s request
+# timeout minus LLM latency, or the client gives up on calls the server still completes and stores.
+RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", "10"))
 PORT = int(os.getenv("PORT", "8000"))
 HOST = os.getenv("HOST", "0.0.0.0")
 
-groq_client = Groq(api_key=GROQ_API_KEY) if (Groq and GROQ_API_KEY) else None  # type: ignore[operator]
-AUTH_TOKENS: Dict[str, str] = json.loads(TOKENS_RAW) if TOKENS_RAW.strip() else {}
+groq_client = AsyncGroq(api_key=GROQ_API_KEY) if (AsyncGroq and GROQ_API_KEY) else None  # type: ignore[operator]
+AUTH_TOKENS: Dict[str, str] = orjson.loads(TOKENS_RAW) if TOKENS_RAW.strip() else {}
 ALLOWED_ORIGINS = [x.strip() for x in ALLOWED_ORIGINS_RAW.split(",") if x.strip()]
 
 # Airtable Setup
-airtable_api = Api(AIRTABLE_API_KEY) if AIRTABLE_API_KEY else None
-table = airtable_api.table(AIRTABLE_BASE_ID, AIRTABLE_TABLE_NAME) if airtable_api and AIRTABLE_BASE_ID else None
+class AirtableError(Exception):
+    pass
+
+class _AirtableTable:
+    """
+    Minimal async Airtable table client sharing one pooled HTTP connection.
+    Mirrors the subset of pyairtable's Table API used by this service.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, table_name: str, base_id: str = ""):
+        self._client = client
+        self._path = f"/{quote(table_name, safe='')}"
+        self._content_url = f"https://content.airtable.com/v0/{base_id}"
+
+    async def _request(self, method: str, path: str, **kwargs: Any) -> Dict[str, Any]:
+        # Retry Airtable's 5 req/s throttling with a short backoff, as pyairtable does by default.
+        for attempt in range(5):
+            response = await self._client.request(method, path, **kwargs)
+            if response.status_code != 429 or attempt == 4:
+                break
+            await asyncio.sleep(0.1 * (2 ** attempt))
+        if response.is_error:
+            raise AirtableError(_airtable_error_text(response))
+        return response.json()
+
+    async def iterate(
+        self,
+        *,
+        formula: Optional[str] = None,
+        max_records: Optional[int] = None,
+        page_size: int = 100,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        params: Dict[str, Any] = {"pageSize": page_size}
+        if formula:
+            params["filterByFormula"] = formula
+        if max_records:
+            params["maxRecords"] = max_records
+        while True:
+            page = await self._request("GET", self._path, params=params)
+            records = page.get("records", [])
+            if records:
+                yield records
+            offset = page.get("offset")
+            if not offset:
+                return
+            params["offset"] = offset
+
+    async def all(self, *, formula: Optional[str] = None, max_records: Optional[int] = None) -> List[Dict[str, Any]]:
+        records: List[Dict[str, Any]] = []
+        async for page in self.iterate(formula=formula, max_records=max_records):
+            records.extend(page)
+        return records
+
+    async def get(self, record_id: str) -> Dict[str, Any]:
+        return await self._request("GET", f"{self._path}/{quote(record_id, safe='')}")
+
+    async def create(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._request("POST", self._path, json={"fields": fields})
+
+    async def update(self, record_id: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._request("PATCH", f"{self._path}/{quote(record_id, safe='')}", json={"fields": fields})
+
+    async def batch_update(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        # Airtable accepts at most 10 records per batch request.
+        return await self._request("PATCH", self._path, json={"records": records, "typecast": True})
+
+    async def upload_attachment(
+        self, record_id: str, field: str, filename: str, content: bytes, content_type: str
+    ) -> Dict[str, Any]:
+        # Appends to the attachment field; Airtable caps direct uploads at 5 MB.
+        return await self._request(
+            "POST",
+            f"{self._content_url}/{quote(record_id, safe='')}/{quote(field, safe='')}/uploadAttachment",
+            json={"contentType": content_type, "file": base64.b64encode(content).decode(), "filename": filename},
+        )
 
-app = FastAPI(title="Cerebro API", description="AI Research Orchestrator Backend")
+def _airtable_error_text(response: httpx.Response) -> str:
+    try:
+        error = response.json().get("error")
+    except ValueError:
+        error = None
+    if isinstance(error, dict):
+        return f"{response.status_code} {error.get('type', '')}: {error.get('message', '')}"
+    return f"{response.status_code} {error or response.text}"
+
+AIRTABLE = httpx.AsyncClient(
+    base_url=f"https://api.airtable.com/v0/{AIRTABLE_BASE_ID}",
+    headers={"Authorization": f"Bearer {AIRTABLE_API_KEY}"},
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+    timeout=10.0,
+) if AIRTABLE_API_KEY and AIRTABLE_BASE_ID else None
+table = _AirtableTable(AIRTABLE, AIRTABLE_TABLE_NAME, AIRTABLE_BASE_ID or "") if AIRTABLE else None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _airtable_write_queue
+    _resolve_spa.cache_clear()
+    _load_assets()
+    _airtable_write_queue = asyncio.Queue()
+    write_worker = asyncio.create_task(_airtable_write_worker(_airtable_write_queue))
+    session_loader.start()
+    unsynced_flusher = asyncio.create_task(_unsynced_flush_worker())
+    yield
+    unsynced_flusher.cancel()
+    await session_loader.stop()
+    await _persist_unsynced_sessions()
+    # The stop marker queues behind any pending record ids, so the worker flushes them before exiting.
+    await _airtable_write_queue.put(_WRITE_QUEUE_STOP)
+    await write_worker
+    _airtable_write_queue = None
+    if AIRTABLE is not None:
+        await AIRTABLE.aclose()
+    if groq_client is not None:
+        await groq_client.close()
+
+app = FastAPI(
+    title="Cerebro API",
+    description="AI Research Orchestrator Backend",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 ROOT_DIR = Path(__file__).resolve().parent
 FRONTEND_DIST = ROOT_DIR / "dist"
-SESSION_CACHE: Dict[str, Dict[str, Any]] = {}
+class _SessionCache(TTLCache):
+    """
+    TTLCache that writes back Data for sessions evicted with refinements not yet synced to Airtable.
+    """
+
+    def popitem(self):
+        key, value = super().popitem()
+        _write_back_unsynced(key, value)
+        return key, value
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        for key, value in expired:
+            _write_back_unsynced(key, value)
+        return expired
+
+    def clear(self):
+        for key, value in list(self.items()):
+            _write_back_unsynced(key, value)
+        super().clear()
+
+# Bounded so long-running processes don't retain every session payload forever.
+SESSION_CACHE: TTLCache = _SessionCache(maxsize=2048, ttl=3600)
+# Short-lived read caches so repeat paging/filter clicks don't round-trip to Airtable.
+HISTORY_CACHE: TTLCache = TTLCache(maxsize=512, ttl=30)
+SESSION_RECORD_CACHE: TTLCache = TTLCache(maxsize=512, ttl=30)
+# session_id -> (record_id, user_id); record ids are stable, so later lookups can skip the formula scan.
+# Bounded by LRU rather than TTL: a dropped entry only costs one formula lookup.
+SESSION_RECORD_INDEX: LRUCache = LRUCache(maxsize=8192)
+# record id -> (raw Data string, parsed blob) for per-session reads; history and CSV scans bypass it.
+# The raw string guards against stale entries.
+_PARSED_BLOB_CACHE: LRUCache = LRUCache(maxsize=1024)
+# (session_id, user_id) -> (content fingerprint, rendered PDF bytes).
+_PDF_CACHE: TTLCache = TTLCache(maxsize=256, ttl=3600)
+# user_id -> finished CSV body, or a pending marker while an export is streaming.
+_CSV_EXPORT_CACHE: TTLCache = TTLCache(maxsize=64, ttl=60)
+# Larger exports are streamed but not cached, so one heavy user can't pin megabytes per cache slot.
+_CSV_EXPORT_CACHE_MAX_CHARS = 512 * 1024
 PROVIDER_ISSUES: Dict[str, Dict[str, str]] = {}
 
 # Rate Limiter Setup (Mimics n8n 5000ms delay)
-limiter = Limiter(key_func=get_remote_address)
-app.state.limiter = limiter
+class AsyncTokenBucket:
+    """
+    Token bucket that delays callers instead of rejecting them.
+    The lock only guards the counters: each caller reserves a token (possibly going into debt),
+    releases the lock, then sleeps off its own wait so no one sleeps while holding it.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0, max_wait: float = RATE_LIMIT_MAX_WAIT):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_wait = max_wait
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> bool:
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if wait > self.max_wait:
+                return False
+            self._tokens -= 1
+        if wait:
+            await asyncio.sleep(wait)
+        return True
 
-def _typed_rate_limit_handler(request: Request, exc: Exception):
-    return _rate_limit_exceeded_handler(request, cast(RateLimitExceeded, exc))
+# Keyed by (user_id, endpoint); idle buckets are dropped since they would be full again anyway.
+RATE_LIMIT_BUCKETS: TTLCache = TTLCache(maxsize=4096, ttl=600)
 
-app.add_exception_handler(RateLimitExceeded, _typed_rate_limit_handler)
+def _rate_limit_identity(request: Request) -> str:
+    # Without API tokens every caller shares DEFAULT_USER_ID, so limit per client address instead.
+    if AUTH_TOKENS:
+        return _resolve_user_id(request)
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+def _rate_limit(endpoint: str, per_seconds: float = 5.0):
+    async def dependency(request: Request) -> None:
+        key = (_rate_limit_identity(request), endpoint)
+        bucket = RATE_LIMIT_BUCKETS.get(key)
+        if bucket is None:
+            bucket = RATE_LIMIT_BUCKETS[key] = AsyncTokenBucket(rate=1 / per_seconds)
+        if not await bucket.acquire():
+            raise HTTPException(status_code=429, detail="Too many requests. Please slow down.")
+    return Depends(dependency)
 
 # CORS Configuration
 app.add_middleware(
@@ -72,6 +287,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress the SPA bundle and large JSON listings; level 6 keeps most of the ratio at far less CPU than 9.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+
 # Models
 class SubTopic(BaseModel):
     id: str
@@ -121,6 +339,15 @@ class RefineResponse(BaseModel):
     sessionId: str
     subtopic: str
     insight: str
+    cached: bool = False
+
+class RefineBulkRequest(BaseModel):
+    sessionId: str
+    subtopics: List[str]
+
+class RefineBulkResponse(BaseModel):
+    sessionId: str
+    refinements: List[RefinementEntry]
 
 class FinalizeRequest(BaseModel):
     sessionId: str
@@ -130,6 +357,7 @@ class FinalizeResponse(BaseModel):
     sessionId: str
     summary: str
     tags: List[str]
+    cached: bool = False
 
 # System Prompt
 SYSTEM_PROMPT = """
@@ -163,6 +391,18 @@ Return ONLY JSON with this schema:
 }
 """
 
+REFINEMENT_BULK_PROMPT = """
+You are a research analyst. Given a topic and several selected subtopics, provide a concise deep-dive insight for each subtopic.
+Return ONLY JSON with this schema:
+{
+  "insights": [
+    {"subtopic": "Selected subtopic, copied verbatim", "insight": "A concise, practical deep dive (4-7 sentences)."}
+  ]
+}
+Constraints:
+1. Return exactly one entry per selected subtopic, in the given order.
+"""
+
 FINALIZE_PROMPT = """
 You are a research summarizer. Given a topic and collected findings, produce a final summary and tags.
 Return ONLY JSON with this schema:
@@ -175,6 +415,23 @@ Constraints:
 2. Tags should be short, title-case, and non-duplicated.
 """
 
+# Prompt prefixes are assembled once at import; request handlers only append the per-request values.
+_SYSTEM_PROMPT_HEADER = SYSTEM_PROMPT + "\n\nUSER TOPIC: "
+_REFINEMENT_TEMPLATE = (
+    REFINEMENT_PROMPT.replace("{", "{{").replace("}", "}}")
+    + "\n\nTOPIC: {title}\nTOPIC DESCRIPTION: {description}\nSELECTED SUBTOPIC: {subtopic}\n"
+)
+_REFINEMENT_BULK_TEMPLATE = (
+    REFINEMENT_BULK_PROMPT.replace("{", "{{").replace("}", "}}")
+    + "\n\nTOPIC: {title}\nTOPIC DESCRIPTION: {description}\nSELECTED SUBTOPICS:\n{subtopics}\n"
+)
+_FINALIZE_TEMPLATE = FINALIZE_PROMPT.replace("{", "{{").replace("}", "}}") + "\n\nTOPIC: {title}\nFINDINGS:\n{findings}\n"
+
+_RETRY_HINT_RE = re.compile(r"retry in ([0-9]+(?:\.[0-9]+)?)s", re.IGNORECASE)
+_INVALID_FIELD_RE = re.compile(
+    r'Unknown field name: "([^"]+)"|Field "([^"]+)" cannot accept a value because the field is computed'
+)
+
 START_SCHEMA: Dict[str, Any] = {
     "type": "object",
     "properties": {
@@ -207,6 +464,26 @@ REFINE_SCHEMA: Dict[str, Any] = {
     "additionalProperties": False,
 }
 
+REFINE_BULK_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "insights": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "subtopic": {"type": "string"},
+                    "insight": {"type": "string"},
+                },
+                "required": ["subtopic", "insight"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["insights"],
+    "additionalProperties": False,
+}
+
 FINALIZE_SCHEMA: Dict[str, Any] = {
     "type": "object",
     "properties": {
@@ -217,7 +494,18 @@ FINALIZE_SCHEMA: Dict[str, Any] = {
     "additionalProperties": False,
 }
 
-def _parse_data_blob(fields: Dict[str, Any]) -> Dict[str, Any]:
+def _parse_data_blob(fields: Dict[str, Any], record_id: Optional[str] = None) -> Dict[str, Any]:
+    raw = fields.get("Data")
+    if record_id and raw is not None:
+        hit = _PARSED_BLOB_CACHE.get(record_id)
+        if hit is not None and hit[0] == raw:
+            return hit[1]
+        data = _decode_data_blob(fields)
+        _PARSED_BLOB_CACHE[record_id] = (raw, data)
+        return data
+    return _decode_data_blob(fields)
+
+def _decode_data_blob(fields: Dict[str, Any]) -> Dict[str, Any]:
     default_outline = {
         "title": fields.get("Topic", "Untitled"),
         "description": fields.get("Initial Outline", ""),
@@ -232,7 +520,7 @@ def _parse_data_blob(fields: Dict[str, Any]) -> Dict[str, Any]:
             "tags": [],
         }
 
-    parsed = json.loads(fields["Data"])
+    parsed = orjson.loads(fields["Data"])
     if isinstance(parsed, dict) and "outline" in parsed:
         return {
             "outline": parsed.get("outline", default_outline),
@@ -249,9 +537,11 @@ def _parse_data_blob(fields: Dict[str, Any]) -> Dict[str, Any]:
         "tags": [],
     }
 
+@functools.lru_cache(maxsize=4096)
 def _build_session_formula(session_id: str, user_id: str) -> str:
     return f"AND({{Session ID}} = '{session_id}', {{User ID}} = '{user_id}')"
 
+@functools.lru_cache(maxsize=4096)
 def _escape_formula(value: str) -> str:
     return value.replace("'", "\\'")
 
@@ -269,28 +559,13 @@ def _resolve_user_id(request: Request) -> str:
         return DEFAULT_USER_ID
     return DEFAULT_USER_ID
 
-def _progress_for(data: Dict[str, Any]) -> int:
-    outline = data.get("outline", {})
-    subtopics = outline.get("subTopics", [])
-    refinements = data.get("refinements", [])
-    summary = str(data.get("summary", "")).strip()
-    tags = data.get("tags", [])
-    progress = 25
-    if subtopics:
-        progress += 25
-    if refinements:
-        progress += 25
-    if summary or tags:
-        progress += 25
-    return min(progress, 100)
-
 def _require_table():
     if not table:
         raise HTTPException(status_code=503, detail="Airtable not configured.")
 
-def _table():
+def _table() -> _AirtableTable:
     _require_table()
-    return cast(Any, table)
+    return cast(_AirtableTable, table)
 
 def _require_genai():
     if not GROQ_API_KEY:
@@ -298,25 +573,46 @@ def _require_genai():
     if groq_client is None:
         raise HTTPException(status_code=500, detail="Groq client is not initialized.")
 
+_UTC = timezone.utc
+
+def _now_iso() -> str:
+    return datetime.now(_UTC).isoformat()
+
 def _set_provider_issue(provider: str, kind: str, message: str) -> None:
     PROVIDER_ISSUES[provider] = {
         "kind": kind,
         "message": message[:300],
-        "updatedAt": datetime.now(timezone.utc).isoformat(),
+        "updatedAt": _now_iso(),
     }
 
 def _clear_provider_issue(provider: str) -> None:
     PROVIDER_ISSUES.pop(provider, None)
 
 def _is_quota_error(err: Exception) -> bool:
-    text = str(err).lower()
-    return (
-        "resource_exhausted" in text
-        or "quota exceeded" in text
-        or "429" in text
-        or "rate limit" in text
-        or "too many requests" in text
-    )
+    return isinstance(err, RateLimitError)
+
+class LLMCache:
+    """
+    In-process TTL/LRU cache of parsed LLM results.
+    Keys hash the model, schema name and a whitespace/case-normalized prompt, so requests
+    that differ only in formatting share an entry.
+    """
+
+    def __init__(self, maxsize: int, ttl: int):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    def _key(prompt: str, schema_name: str) -> str:
+        normalized = " ".join(prompt.split()).lower()
+        return hashlib.sha256(f"{GROQ_MODEL}\0{schema_name}\0{normalized}".encode()).hexdigest()
+
+    def get(self, prompt: str, schema_name: str) -> Optional[Dict[str, Any]]:
+        return self._cache.get(self._key(prompt, schema_name))
+
+    def set(self, prompt: str, schema_name: str, value: Dict[str, Any]) -> None:
+        self._cache[self._key(prompt, schema_name)] = value
+
+LLM_CACHE = LLMCache(maxsize=LLM_CACHE_MAX, ttl=LLM_CACHE_TTL)
 
 class _LLMTextResponse:
     def __init__(self, text: str):
@@ -346,12 +642,49 @@ def _fallback_refinement(subtopic: str, topic: str) -> str:
         "Focus on definitions, current patterns, measurable outcomes, constraints, and practical next steps."
     )
 
-def _fallback_finalize(outline: Dict[str, Any], refinements: List[Dict[str, Any]]) -> Dict[str, Any]:
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD_RE = re.compile(r"\w+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+@functools.lru_cache(maxsize=512)
+def _extractive_summary(findings_text: str, max_sentences: int = 5) -> str:
+    """
+    Pick the highest tf-idf scoring sentences from the findings, kept in their original order.
+    """
+    sentences = [x.strip(" -") for x in _SENTENCE_SPLIT_RE.split(findings_text) if len(x.strip(" -")) > 20]
+    if len(sentences) <= max_sentences:
+        return " ".join(sentences)
+    docs = [[w for w in _WORD_RE.findall(x.lower()) if w not in _STOPWORDS] for x in sentences]
+    df: Dict[str, int] = {}
+    for words in docs:
+        for w in set(words):
+            df[w] = df.get(w, 0) + 1
+    n = len(docs)
+    scores = []
+    for i, words in enumerate(docs):
+        if not words:
+            scores.append((0.0, i))
+            continue
+        tf: Dict[str, int] = {}
+        for w in words:
+            tf[w] = tf.get(w, 0) + 1
+        score = sum(c * math.log(n / df[w]) for w, c in tf.items()) / math.sqrt(len(words))
+        scores.append((score, i))
+    keep = sorted(i for _, i in sorted(scores, reverse=True)[:max_sentences])
+    return " ".join(sentences[i] for i in keep)
+
+def _fallback_finalize(outline: Dict[str, Any], findings_text: str) -> Dict[str, Any]:
     title = outline.get("title", "Untitled Topic")
-    summary = (
-        f"This session on {title} was finalized with local fallback logic due to LLM quota exhaustion. "
-        "You have a clear topic framing, subtopic breakdown, and stored refinements to continue analysis."
-    )
+    extract = _extractive_summary(findings_text)
+    if extract:
+        summary = f"Locally generated summary of {title} (LLM quota exhausted): {extract}"
+    else:
+        summary = (
+            f"This session on {title} was finalized with local fallback logic due to LLM quota exhaustion. "
+            "You have a clear topic framing, subtopic breakdown, and stored refinements to continue analysis."
+        )
     tags = [x.get("title", "") for x in outline.get("subTopics", [])[:5]]
     tags = [t for t in tags if t] or ["Research", "Fallback", "Analysis"]
     return {"summary": summary, "tags": tags}
@@ -370,7 +703,7 @@ async def _generate_content_with_retry(
     last_error: Optional[Exception] = None
     for attempt in range(max_retries + 1):
         try:
-            completion = groq_client.chat.completions.create(  # type: ignore[union-attr]
+            completion = await groq_client.chat.completions.create(  # type: ignore[union-attr]
                 model=GROQ_MODEL,
                 messages=[
                     {"role": "system", "content": "Return only valid JSON."},
@@ -387,7 +720,7 @@ async def _generate_content_with_retry(
                 # Respect provider hint when present, but never wait less than wait_ms.
                 txt = str(err)
                 delay_ms = wait_ms
-                m = re.search(r"retry in ([0-9]+(?:\.[0-9]+)?)s", txt, flags=re.IGNORECASE)
+                m = _RETRY_HINT_RE.search(txt)
                 if m:
                     hinted_ms = int(float(m.group(1)) * 1000)
                     delay_ms = max(wait_ms, hinted_ms)
@@ -398,27 +731,242 @@ async def _generate_content_with_retry(
         raise last_error
     raise RuntimeError("LLM request failed unexpectedly.")
 
-def _matches_filters(outline: Dict[str, Any], tags: List[str], category_values: List[str], search: str) -> bool:
-    if category_values:
-        tag_l = [t.lower() for t in tags]
-        if not any(any(cat in t for t in tag_l) for cat in category_values):
-            return False
+async def _stream_llm_text(contents: str) -> AsyncIterator[str]:
+    """
+    Yield Groq completion text deltas as they arrive.
+    Groq's JSON mode can't be combined with streaming, so the prompt alone asks for JSON.
+    """
+    stream = await groq_client.chat.completions.create(  # type: ignore[union-attr]
+        model=GROQ_MODEL,
+        messages=[
+            {"role": "system", "content": "Return only valid JSON."},
+            {"role": "user", "content": contents},
+        ],
+        temperature=0.2,
+        stream=True,
+    )
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
 
-    if search:
-        title = str(outline.get("title", "")).lower()
-        description = str(outline.get("description", "")).lower()
-        subtopics = [str(x.get("title", "")).lower() for x in outline.get("subTopics", [])]
-        tags_l = [t.lower() for t in tags]
-        if (
-            search not in title
-            and search not in description
-            and all(search not in x for x in subtopics)
-            and all(search not in x for x in tags_l)
-        ):
-            return False
+def _parse_streamed_json(text: str) -> Dict[str, Any]:
+    # Without JSON mode the model may wrap the object in prose or code fences.
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end < start:
+        return {}
+    parsed = orjson.loads(text[start:end + 1])
+    return parsed if isinstance(parsed, dict) else {}
+
+_JSON_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+class _StreamedField:
+    """
+    Incrementally decode one string field of a streamed JSON object.
+    feed() returns the newly completed part of the field's text, so SSE deltas
+    carry the same plain text as the cached and fallback paths.
+    """
+
+    def __init__(self, name: str):
+        self._key = re.compile(r'"%s"\s*:\s*"' % re.escape(name))
+        self._text = ""
+        self._pos = -1
+        self._done = False
+
+    def feed(self, chunk: str) -> str:
+        self._text += chunk
+        if self._done:
+            return ""
+        if self._pos < 0:
+            match = self._key.search(self._text)
+            if not match:
+                return ""
+            self._pos = match.end()
+        text, i, out = self._text, self._pos, []
+        while i < len(text):
+            ch = text[i]
+            if ch == '"':
+                self._done = True
+                break
+            if ch != "\\":
+                out.append(ch)
+                i += 1
+                continue
+            if i + 1 >= len(text):
+                break
+            if text[i + 1] != "u":
+                out.append(_JSON_ESCAPES.get(text[i + 1], text[i + 1]))
+                i += 2
+                continue
+            # \uXXXX, or a \uXXXX\uXXXX surrogate pair; wait for the rest if it is split across chunks.
+            width = 12 if text[i + 2:i + 4].lower() in ("d8", "d9", "da", "db") else 6
+            if i + 6 > len(text) or i + width > len(text):
+                break
+            try:
+                out.append(orjson.loads(f'"{text[i:i + width]}"'))
+            except orjson.JSONDecodeError:
+                out.append(text[i:i + width])
+            i += width
+        self._pos = i
+        return "".join(out)
+
+def _sse_frame(payload: Any) -> str:
+    return f"data: {orjson.dumps(payload).decode()}\n\n"
+
+def _refinement_prompt(outline: Dict[str, Any], subtopic: str) -> str:
+    return _REFINEMENT_TEMPLATE.format_map({
+        "title": outline.get("title", subtopic),
+        "description": outline.get("description", ""),
+        "subtopic": subtopic,
+    })
+
+def _finalize_prompt(outline: Dict[str, Any], refinements: List[Dict[str, Any]], cached: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+    """
+    Returns (findings_text, prompt), reusing the cache entry's incrementally built findings when present.
+    """
+    findings_text = (cached or {}).get("findings_text")
+    if findings_text is None:
+        parts = []
+        if desc := str(outline.get("description") or "").strip():
+            parts.append(f"- {desc}")
+        parts.extend(f"- {ins}" for r in refinements if (ins := str(r.get("insight") or "").strip()))
+        findings_text = "\n".join(parts)
+    prompt = _FINALIZE_TEMPLATE.format_map({"title": outline.get("title", "Untitled"), "findings": findings_text})
+    return findings_text, prompt
+
+async def _generate_refinement(outline: Dict[str, Any], subtopic: str) -> Tuple[str, bool]:
+    """
+    Returns (insight, cached). Only real LLM answers are cached; local fallbacks are not.
+    """
+    prompt = _refinement_prompt(outline, subtopic)
+    hit = LLM_CACHE.get(prompt, "refine")
+    if hit is not None:
+        return hit["insight"], True
+    try:
+        response = await _generate_content_with_retry(
+            prompt,
+            max_retries=1,
+            wait_ms=10000,
+            response_json_schema=REFINE_SCHEMA,
+        )
+        parsed = orjson.loads(response.text or "{}")
+        insight = str(parsed.get("insight", "")).strip()
+        _clear_provider_issue("llm")
+        if insight:
+            LLM_CACHE.set(prompt, "refine", {"insight": insight})
+        return insight, False
+    except Exception as llm_error:
+        if _is_quota_error(llm_error) and ENABLE_FALLBACK_ON_QUOTA:
+            _set_provider_issue("llm", "quota", str(llm_error))
+            return _fallback_refinement(subtopic, outline.get("title", subtopic)), False
+        elif _is_quota_error(llm_error):
+            _set_provider_issue("llm", "quota", str(llm_error))
+            raise HTTPException(status_code=429, detail="LLM quota exhausted. Cannot generate deep-dive.")
+        else:
+            _set_provider_issue("llm", "error", str(llm_error))
+            raise
+
+async def _generate_refinements_bulk(outline: Dict[str, Any], subtopics: List[str]) -> Dict[str, str]:
+    """
+    Generate insights for several subtopics with a single LLM call.
+    Returns a mapping of requested subtopic -> insight; subtopics the model skipped are omitted.
+    """
+    title = outline.get("title", "Untitled")
+    try:
+        response = await _generate_content_with_retry(
+            _REFINEMENT_BULK_TEMPLATE.format_map({
+                "title": title,
+                "description": outline.get("description", ""),
+                "subtopics": "\n".join(f"- {x}" for x in subtopics),
+            }),
+            max_retries=1,
+            wait_ms=10000,
+            response_json_schema=REFINE_BULK_SCHEMA,
+        )
+        parsed = orjson.loads(response.text or "{}")
+        _clear_provider_issue("llm")
+    except Exception as llm_error:
+        if _is_quota_error(llm_error) and ENABLE_FALLBACK_ON_QUOTA:
+            _set_provider_issue("llm", "quota", str(llm_error))
+            return {x: _fallback_refinement(x, title) for x in subtopics}
+        elif _is_quota_error(llm_error):
+            _set_provider_issue("llm", "quota", str(llm_error))
+            raise HTTPException(status_code=429, detail="LLM quota exhausted. Cannot generate deep-dive.")
+        else:
+            _set_provider_issue("llm", "error", str(llm_error))
+            raise
+
+    requested = {x.lower(): x for x in subtopics}
+    insights: Dict[str, str] = {}
+    for entry in parsed.get("insights", []):
+        if not isinstance(entry, dict):
+            continue
+        subtopic = requested.get(str(entry.get("subtopic", "")).strip().lower())
+        insight = str(entry.get("insight", "")).strip()
+        if subtopic and insight and subtopic not in insights:
+            insights[subtopic] = insight
+    return insights
+
+def _construct_outline(outline: Dict[str, Any]) -> ResearchOutline:
+    """Build a ResearchOutline from our own stored payload without re-running validation."""
+    return ResearchOutline.model_construct(
+        title=str(outline.get("title", "")),
+        description=str(outline.get("description", "")),
+        subTopics=[
+            SubTopic.model_construct(
+                id=str(s.get("id", "")),
+                title=str(s.get("title", "")),
+                description=str(s.get("description", "")),
+            )
+            for s in outline.get("subTopics", [])
+        ],
+    )
+
+def _construct_refinements(refinements: List[Dict[str, Any]]) -> List[RefinementEntry]:
+    return [
+        RefinementEntry.model_construct(
+            subtopic=str(x.get("subtopic", "")),
+            insight=str(x.get("insight", "")),
+            createdAt=x.get("createdAt"),
+        )
+        for x in refinements
+    ]
+
+def _dedupe_tags(tags: List[str]) -> List[str]:
+    """
+    Strip tags (or other short labels) and drop case-insensitive duplicates, keeping the first spelling.
+    """
+    seen = set()
+    deduped = []
+    for t in tags:
+        tag = str(t).strip()
+        key = tag.lower()
+        if key and key not in seen:
+            seen.add(key)
+            deduped.append(tag)
+    return deduped
+
+def _search_blobs(outline: Dict[str, Any], tags: List[str]) -> Tuple[str, str]:
+    """
+    Build lowercase (search_blob, tag_blob) strings for filtering.
+    Values are newline-joined so a substring match can't span two fields.
+    """
+    tag_blob = "\n".join(tags).lower()
+    search_blob = "\n".join([
+        str(outline.get("title", "")),
+        str(outline.get("description", "")),
+        *[str(x.get("title", "")) for x in outline.get("subTopics", [])],
+    ]).lower()
+    return f"{search_blob}\n{tag_blob}", tag_blob
+
+def _matches_filters(search_blob: str, tag_blob: str, category_values: Tuple[str, ...], search: str) -> bool:
+    if category_values and not any(cat in tag_blob for cat in category_values):
+        return False
+    if search and search not in search_blob:
+        return False
     return True
 
-def _build_history_formula(user_id: str, category_values: List[str], search: str) -> str:
+@functools.lru_cache(maxsize=1024)
+def _build_history_formula(user_id: str, category_values: Tuple[str, ...], search: str) -> str:
     clauses = [f"{{User ID}} = '{_escape_formula(user_id)}'"]
     if category_values:
         tag_clauses = [f"FIND('{_escape_formula(cat)}', LOWER({{Tags}}))" for cat in category_values]
@@ -435,77 +983,266 @@ def _build_history_formula(user_id: str, category_values: List[str], search: str
         )
     return f"AND({','.join(clauses)})"
 
-def _build_history_items(user_id: str, category: str, search: str, limit: Optional[int] = None) -> List[ResearchResponse]:
+def _build_one_item(record: Dict[str, Any], category_values: Tuple[str, ...], search: str) -> Optional[ResearchResponse]:
+    """
+    Decode, filter and build one history item in a single pass over the record.
+    Returns None when the record doesn't match the category/search filters.
+    """
+    fields = record["fields"]
+    data = _parse_data_blob(fields)
+    outline = data["outline"]
+    tags = [str(x).strip() for x in data["tags"] if str(x).strip()]
+
+    if category_values or search:
+        cached = _cache_get(str(fields.get("Session ID", "")), str(fields.get("User ID", "")))
+        if cached:
+            search_blob, tag_blob = cached["search_blob"], cached["tag_blob"]
+        else:
+            search_blob, tag_blob = _search_blobs(outline, tags)
+        if not _matches_filters(search_blob, tag_blob, category_values, search):
+            return None
+
+    progress = 25
+    if outline.get("subTopics"):
+        progress += 25
+    if data["refinements"]:
+        progress += 25
+    if data["summary"] or tags:
+        progress += 25
+
+    return ResearchResponse.model_construct(
+        sessionId=fields.get("Session ID") or record.get("id") or "UNKNOWN",
+        outline=_construct_outline(outline),
+        createdAt=fields.get("Created Time") or record.get("createdTime"),
+        tags=tags,
+        progress=progress,
+    )
+
+async def _collect_history_items(
+    formula: str,
+    category_values: Tuple[str, ...],
+    search: str,
+    limit: Optional[int],
+    server_filtered: bool,
+) -> List[ResearchResponse]:
+    """
+    Page through matching records and stop fetching as soon as `limit` items pass the filters.
+    When Airtable already applied the filters in `formula`, records are not re-filtered here
+    and `limit` is passed on as maxRecords so Airtable doesn't send rows past it.
+    """
+    max_records = None
+    page_size = 100
+    if server_filtered:
+        category_values, search = (), ""
+        if limit:
+            max_records, page_size = limit, min(100, limit)
+    items: List[ResearchResponse] = []
+    async for page in _table().iterate(formula=formula, max_records=max_records, page_size=page_size):
+        for r in page:
+            item = _build_one_item(r, category_values, search)
+            if item is None:
+                continue
+            items.append(item)
+            if limit and len(items) >= limit:
+                return items
+    return items
+
+async def _build_history_items(user_id: str, category: str, search: str, limit: Optional[int] = None) -> List[ResearchResponse]:
     normalized_category = category.strip().lower()
-    category_values = [] if (not normalized_category or normalized_category == "all") else [c.strip() for c in normalized_category.split(",") if c.strip()]
+    category_values = () if (not normalized_category or normalized_category == "all") else tuple(c.strip() for c in normalized_category.split(",") if c.strip())
     normalized_search = search.strip().lower()
+    cache_key = ("items", user_id, normalized_category, normalized_search, limit)
+    cached_items = HISTORY_CACHE.get(cache_key)
+    if cached_items is not None:
+        return cached_items
+
     formula = _build_history_formula(user_id, category_values, normalized_search)
     try:
-        records = _table().all(
-            formula=formula,
-            max_records=limit,
-        )
+        items = await _collect_history_items(formula, category_values, normalized_search, limit, server_filtered=True)
     except Exception:
         # Backward compatibility with bases that don't have optional computed fields (e.g., Tags/Summary/Search Text).
-        records = _table().all(
-            formula=f"{{User ID}} = '{_escape_formula(user_id)}'",
-            max_records=limit,
+        items = await _collect_history_items(
+            f"{{User ID}} = '{_escape_formula(user_id)}'",
+            category_values,
+            normalized_search,
+            limit,
+            server_filtered=False,
         )
-
-    items: List[ResearchResponse] = []
-    for r in records:
-        fields = r["fields"]
-        data = _parse_data_blob(fields)
-        outline = data["outline"]
-        tags = [str(x).strip() for x in data.get("tags", []) if str(x).strip()]
-
-        if not _matches_filters(outline, tags, category_values, normalized_search):
-            continue
-
-        items.append(ResearchResponse.model_validate({
-            "sessionId": fields.get("Session ID") or r.get("id") or "UNKNOWN",
-            "outline": ResearchOutline.model_validate(outline),
-            "createdAt": fields.get("Created Time") or r.get("createdTime"),
-            "tags": tags,
-            "progress": _progress_for(data),
-        }))
+    HISTORY_CACHE[cache_key] = items
     return items
 
-def _find_session_record(session_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+async def _build_history_categories(user_id: str) -> List[str]:
+    cache_key = ("categories", user_id)
+    cached_categories = HISTORY_CACHE.get(cache_key)
+    if cached_categories is not None:
+        return cached_categories
+
+    records = await _table().all(
+        formula=f"{{User ID}} = '{_escape_formula(user_id)}'",
+        max_records=500,
+    )
+    categories: List[str] = []
+    seen = set()
+    for r in records:
+        data = _parse_data_blob(r["fields"])
+        for tag in data.get("tags", []):
+            tag_s = str(tag).strip()
+            if not tag_s:
+                continue
+            key = tag_s.lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            categories.append(tag_s)
+    categories.sort()
+    HISTORY_CACHE[cache_key] = categories
+    return categories
+
+def _invalidate_user_cache(user_id: str, session_id: Optional[str] = None) -> None:
+    for key in [k for k in HISTORY_CACHE.keys() if k[1] == user_id]:
+        HISTORY_CACHE.pop(key, None)
+    _CSV_EXPORT_CACHE.pop(user_id, None)
+    if session_id:
+        SESSION_RECORD_CACHE.pop((session_id, user_id), None)
+
+async def _find_session_record(session_id: str, user_id: str) -> Optional[Dict[str, Any]]:
     if not table:
         return None
-    # Primary lookup by Session ID field.
-    records = _table().all(formula=_build_session_formula(_escape_formula(session_id), _escape_formula(user_id)), max_records=1)
-    if records:
-        return records[0]
+    cache_key = (session_id, user_id)
+    cached_record = SESSION_RECORD_CACHE.get(cache_key)
+    if cached_record is not None:
+        return cached_record
+
+    indexed = SESSION_RECORD_INDEX.get(session_id)
+    if indexed and indexed[1] == user_id:
+        try:
+            rec = await _table().get(indexed[0])
+            if rec.get("fields", {}).get("User ID") == user_id:
+                SESSION_RECORD_CACHE[cache_key] = rec
+                return rec
+        except Exception:
+            pass
+        # Record was deleted or reassigned; fall back to the formula scan.
+        SESSION_RECORD_INDEX.pop(session_id, None)
+
+    # Primary lookup by Session ID field, batched with any concurrent lookups.
+    found = await session_loader.load(session_id, user_id)
+    if found:
+        SESSION_RECORD_INDEX[session_id] = (found["id"], user_id)
+        SESSION_RECORD_CACHE[cache_key] = found
+        return found
 
     # Fallback lookup by Airtable record id when Session ID is computed/non-writable.
     try:
-        rec = _table().get(session_id)
+        rec = await _table().get(session_id)
         if rec and rec.get("fields", {}).get("User ID") == user_id:
+            SESSION_RECORD_INDEX[session_id] = (rec["id"], user_id)
+            SESSION_RECORD_CACHE[cache_key] = rec
             return rec
     except Exception:
         pass
     return None
 
+def _indexed_record_stub(session_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Record id only, from the session index, for writers that already hold the cached Data.
+    Avoids an Airtable GET when the handler only needs the id for its PATCH.
+    """
+    indexed = SESSION_RECORD_INDEX.get(session_id)
+    if indexed and indexed[1] == user_id:
+        return {"id": indexed[0], "fields": {}}
+    return None
+
+class SessionLoader:
+    """
+    Coalesces concurrent Session ID lookups into one OR(...) formula query.
+    Requests arriving within `window` seconds of each other (up to `batch_size`) share a round-trip.
+    """
+
+    def __init__(self, batch_size: int = 10, window: float = 0.01):
+        self.batch_size = batch_size
+        self.window = window
+        self._queue: Optional["asyncio.Queue[Optional[Tuple[Tuple[str, str], asyncio.Future]]]"] = None
+        self._worker: Optional["asyncio.Task[None]"] = None
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run(self._queue))
+
+    async def stop(self) -> None:
+        if self._queue is None or self._worker is None:
+            return
+        await self._queue.put(None)
+        await self._worker
+        self._queue = self._worker = None
+
+    async def load(self, session_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        if self._queue is None:
+            records = await _table().all(
+                formula=_build_session_formula(_escape_formula(session_id), _escape_formula(user_id)),
+                max_records=1,
+            )
+            return records[0] if records else None
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self._queue.put(((session_id, user_id), future))
+        return await future
+
+    async def _run(self, queue: "asyncio.Queue[Optional[Tuple[Tuple[str, str], asyncio.Future]]]") -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            batch: List[Tuple[Tuple[str, str], asyncio.Future]] = []
+            deadline: Optional[float] = None
+            while len(batch) < self.batch_size:
+                if deadline is None:
+                    item = await queue.get()
+                    deadline = loop.time() + self.window
+                else:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            if batch:
+                await self._resolve(batch)
+
+    async def _resolve(self, batch: List[Tuple[Tuple[str, str], asyncio.Future]]) -> None:
+        keys = list(dict.fromkeys(key for key, _ in batch))
+        formula = "OR(" + ", ".join(
+            _build_session_formula(_escape_formula(sid), _escape_formula(uid)) for sid, uid in keys
+        ) + ")"
+        try:
+            records = await _table().all(formula=formula)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        found: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for rec in records:
+            fields = rec.get("fields", {})
+            found.setdefault((str(fields.get("Session ID", "")), str(fields.get("User ID", ""))), rec)
+        for key, future in batch:
+            if not future.done():
+                future.set_result(found.get(key))
+
+session_loader = SessionLoader()
+
 def _strip_invalid_airtable_field(err: Exception, payload: Dict[str, Any]) -> bool:
     """
     Remove one invalid/non-writable field from payload if error message identifies it.
     Returns True when a field was removed and caller can retry.
     """
     text = str(err)
-    marker_unknown = 'Unknown field name: "'
-    marker_computed = 'Field "'
-    marker_computed_suffix = '" cannot accept a value because the field is computed'
-
-    if marker_unknown in text:
-        field = text.split(marker_unknown, 1)[1].split('"', 1)[0]
-        if field in payload:
-            payload.pop(field, None)
-            return True
-
-    if marker_computed in text and marker_computed_suffix in text:
-        field = text.split(marker_computed, 1)[1].split('"', 1)[0]
+    m = _INVALID_FIELD_RE.search(text)
+    if m:
+        field = m.group(1) or m.group(2)
         if field in payload:
             payload.pop(field, None)
             return True
@@ -518,35 +1255,129 @@ def _strip_invalid_airtable_field(err: Exception, payload: Dict[str, Any]) -> bo
 
     return False
 
-def _create_record_resilient(fields: Dict[str, Any]) -> Dict[str, Any]:
+async def _create_record_resilient(fields: Dict[str, Any]) -> Dict[str, Any]:
     """
     Create Airtable record while tolerating schema drift (unknown/computed fields).
     """
     attempt_fields = dict(fields)
     for _ in range(8):
         try:
-            return _table().create(attempt_fields)
+            return await _table().create(attempt_fields)
         except Exception as e:
             if _strip_invalid_airtable_field(e, attempt_fields):
                 continue
             raise
     raise RuntimeError("Unable to create Airtable record after removing invalid fields.")
 
-def _update_record_resilient(record_id: str, fields: Dict[str, Any]) -> None:
+async def _update_record_resilient(record_id: str, fields: Dict[str, Any]) -> None:
     """
     Update Airtable record while tolerating schema drift (unknown/computed fields).
     """
     attempt_fields = dict(fields)
     for _ in range(8):
         try:
-            _table().update(record_id, attempt_fields)
+            await _table().update(record_id, attempt_fields)
             return
         except Exception as e:
             if _strip_invalid_airtable_field(e, attempt_fields):
                 continue
             raise
     # Last resort: keep critical state update only.
-    _table().update(record_id, {"Data": fields.get("Data", "{}"), "Status": fields.get("Status", "Updated")})
+    await _table().update(record_id, {"Data": fields.get("Data", "{}"), "Status": fields.get("Status", "Updated")})
+
+# Coalesced record updates: handlers enqueue fields and return, a background worker PATCHes
+# up to AIRTABLE_BATCH_SIZE records per request after waiting at most AIRTABLE_BATCH_WINDOW_SECONDS.
+AIRTABLE_BATCH_SIZE = 10
+AIRTABLE_BATCH_WINDOW_SECONDS = 0.2
+_WRITE_QUEUE_STOP = ""
+# Created by the lifespan handler; None means no worker is running and writes go out directly.
+_airtable_write_queue: Optional["asyncio.Queue[str]"] = None
+# record_id -> pending write; repeated updates merge so the latest value of each field wins.
+_PENDING_WRITES: Dict[str, Dict[str, Any]] = {}
+# record_id -> fields of a write currently being sent; readers prefer these over the stale record.
+_INFLIGHT_WRITES: Dict[str, Dict[str, Any]] = {}
+
+def _record_data(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Session data for a fetched record, preferring a Data blob that is queued or in flight to Airtable.
+    """
+    record_id = record.get("id")
+    for writes in (_PENDING_WRITES.get(record_id or "", {}).get("fields"), _INFLIGHT_WRITES.get(record_id or "")):
+        if writes and "Data" in writes:
+            return _parse_data_blob({**record["fields"], "Data": writes["Data"]})
+    return _parse_data_blob(record["fields"], record_id)
+
+def _stage_record_update(record_id: str, fields: Dict[str, Any], session_id: str, user_id: str) -> bool:
+    """
+    Merge fields into the pending write for record_id. Returns True when the record still needs to be queued.
+    """
+    _PARSED_BLOB_CACHE.pop(record_id, None)
+    pending = _PENDING_WRITES.get(record_id)
+    if pending is not None:
+        pending["fields"].update(fields)
+        return False
+    _PENDING_WRITES[record_id] = {"fields": dict(fields), "session_id": session_id, "user_id": user_id}
+    return True
+
+async def _enqueue_record_update(record_id: str, fields: Dict[str, Any], session_id: str, user_id: str) -> None:
+    if not _stage_record_update(record_id, fields, session_id, user_id):
+        return
+    if _airtable_write_queue is None:
+        await _flush_record_updates([record_id])
+        return
+    await _airtable_write_queue.put(record_id)
+
+async def _flush_record_updates(record_ids: List[str]) -> None:
+    writes = [(rid, _PENDING_WRITES.pop(rid)) for rid in record_ids if rid in _PENDING_WRITES]
+    if not writes:
+        return
+    for rid, w in writes:
+        _INFLIGHT_WRITES[rid] = w["fields"]
+    failed = False
+    try:
+        await _table().batch_update([{"id": rid, "fields": w["fields"]} for rid, w in writes])
+    except Exception:
+        # One unknown/computed field rejects the whole batch; retry each record with the resilient path.
+        for rid, w in writes:
+            try:
+                await _update_record_resilient(rid, w["fields"])
+            except Exception as e:
+                failed = True
+                _set_provider_issue("airtable", "write_error", str(e))
+                print(f"Airtable Storage Error: {str(e)}")
+    for rid, w in writes:
+        _INFLIGHT_WRITES.pop(rid, None)
+        _PARSED_BLOB_CACHE.pop(rid, None)
+        _invalidate_user_cache(w["user_id"], w["session_id"])
+    if not failed:
+        _clear_provider_issue("airtable")
+
+async def _airtable_write_worker(queue: "asyncio.Queue[str]") -> None:
+    loop = asyncio.get_running_loop()
+    stopping = False
+    while not stopping:
+        record_ids: List[str] = []
+        deadline: Optional[float] = None
+        while len(record_ids) < AIRTABLE_BATCH_SIZE:
+            if deadline is None:
+                record_id = await queue.get()
+                deadline = loop.time() + AIRTABLE_BATCH_WINDOW_SECONDS
+            else:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    record_id = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if record_id == _WRITE_QUEUE_STOP:
+                stopping = True
+                break
+            record_ids.append(record_id)
+        try:
+            await _flush_record_updates(record_ids)
+        except Exception as e:
+            _set_provider_issue("airtable", "write_error", str(e))
 
 def _cache_get(session_id: str, user_id: str) -> Optional[Dict[str, Any]]:
     item = SESSION_CACHE.get(session_id)
@@ -556,15 +1387,79 @@ def _cache_get(session_id: str, user_id: str) -> Optional[Dict[str, Any]]:
         return None
     return item
 
-def _cache_put(session_id: str, user_id: str, data: Dict[str, Any], created_at: Optional[str] = None) -> None:
+def _cache_put(
+    session_id: str,
+    user_id: str,
+    data: Dict[str, Any],
+    created_at: Optional[str] = None,
+    search_text: Optional[str] = None,
+    unsynced_refines: int = 0,
+    findings_text: Optional[str] = None,
+) -> None:
+    tags = [str(x).strip() for x in data.get("tags", []) if str(x).strip()]
+    search_blob, tag_blob = _search_blobs(data.get("outline", {}), tags)
     SESSION_CACHE[session_id] = {
         "user_id": user_id,
-        "created_at": created_at or datetime.now(timezone.utc).isoformat(),
+        "created_at": created_at or _now_iso(),
         "data": data,
+        "search_blob": search_blob,
+        "tag_blob": tag_blob,
+        # Last Search Text written to Airtable, extended in place by each refine.
+        "search_text": search_text,
+        # Refinements appended since Data was last persisted.
+        "unsynced_refines": unsynced_refines,
+        # "- finding" lines for the finalize prompt, built incrementally; None means rebuild.
+        "findings_text": findings_text,
     }
 
-@app.post("/research/start", response_model=ResearchResponse)
-@limiter.limit("1/5seconds")
+def _extend_findings_text(findings_text: Optional[str], insights: List[str]) -> Optional[str]:
+    if findings_text is None:
+        return None
+    lines = "\n".join(f"- {ins}" for x in insights if (ins := str(x).strip()))
+    if not findings_text or not lines:
+        return findings_text or lines
+    return f"{findings_text}\n{lines}"
+
+# Holds direct flushes started outside the write worker so they aren't garbage collected mid-flight.
+_WRITE_BACK_TASKS: Set["asyncio.Task[None]"] = set()
+
+def _write_back_unsynced(session_id: str, item: Dict[str, Any]) -> None:
+    """
+    Queue a Data write for a cache entry holding refinements that only live in memory.
+    Synchronous so cache eviction can call it.
+    """
+    indexed = SESSION_RECORD_INDEX.get(session_id)
+    if not table or not item.get("unsynced_refines") or not indexed or indexed[1] != item["user_id"]:
+        return
+    item["unsynced_refines"] = 0
+    record_id = indexed[0]
+    if not _stage_record_update(record_id, {"Data": orjson.dumps(item["data"]).decode()}, session_id, item["user_id"]):
+        return
+    if _airtable_write_queue is not None:
+        _airtable_write_queue.put_nowait(record_id)
+        return
+    try:
+        task = asyncio.get_running_loop().create_task(_flush_record_updates([record_id]))
+    except RuntimeError:
+        # No loop (e.g. import-time tooling); the staged write goes out with the next flush of this record.
+        return
+    _WRITE_BACK_TASKS.add(task)
+    task.add_done_callback(_WRITE_BACK_TASKS.discard)
+
+async def _persist_unsynced_sessions() -> None:
+    """
+    Write Data for cached sessions whose latest refinements only live in memory.
+    """
+    for session_id, item in list(SESSION_CACHE.items()):
+        _write_back_unsynced(session_id, item)
+
+async def _unsynced_flush_worker() -> None:
+    # Bounds how long refinements live only in this process if it crashes or the user goes idle.
+    while True:
+        await asyncio.sleep(REFINE_DATA_FLUSH_SECONDS)
+        await _persist_unsynced_sessions()
+
+@app.post("/research/start", response_model=ResearchResponse, dependencies=[_rate_limit("start")])
 async def start_research(request: Request, payload: ResearchRequest):
     _require_genai()
     user_id = _resolve_user_id(request)
@@ -572,12 +1467,12 @@ async def start_research(request: Request, payload: ResearchRequest):
     try:
         try:
             response = await _generate_content_with_retry(
-                f"{SYSTEM_PROMPT}\n\nUSER TOPIC: {payload.topic}",
+                _SYSTEM_PROMPT_HEADER + payload.topic,
                 max_retries=1,
                 wait_ms=10000,
                 response_json_schema=START_SCHEMA,
             )
-            raw_data = json.loads(response.text or "{}")
+            raw_data = orjson.loads(response.text or "{}")
             _clear_provider_issue("llm")
         except Exception as llm_error:
             if _is_quota_error(llm_error) and ENABLE_FALLBACK_ON_QUOTA:
@@ -607,9 +1502,10 @@ async def start_research(request: Request, payload: ResearchRequest):
             }
 
             session_id = generated_session_id
+            subtopics_list = ", ".join([s["title"] for s in raw_data.get("subTopics", [])])
+            search_text = f"{payload.topic} {subtopics_list} {raw_data.get('description', '')}"
             if table:
                 try:
-                    subtopics_list = ", ".join([s["title"] for s in raw_data.get("subTopics", [])])
                     create_fields = {
                         "Session ID": session_id,
                         "User ID": user_id,
@@ -618,21 +1514,29 @@ async def start_research(request: Request, payload: ResearchRequest):
                         "Initial Outline": raw_data.get("description", ""),
                         "Summary": "",
                         "Tags": "",
-                        "Search Text": f"{payload.topic} {subtopics_list} {raw_data.get('description', '')}",
+                        "Search Text": search_text,
                         "Status": "Initialized",
-                        "Data": json.dumps(session_payload),
+                        "Data": orjson.dumps(session_payload).decode(),
                     }
-                    rec = _create_record_resilient(create_fields)
+                    rec = await _create_record_resilient(create_fields)
                     rec_fields = rec.get("fields", {})
                     # Airtable bases often use a computed Session ID (e.g., from RECORD_ID()).
                     # Always return the persisted value so refine/finalize can resolve the same record.
                     persisted_session_id = rec_fields.get("Session ID") or rec.get("id")
                     if persisted_session_id:
                         session_id = str(persisted_session_id)
+                    SESSION_RECORD_INDEX[session_id] = (rec["id"], user_id)
+                    _invalidate_user_cache(user_id)
                 except Exception as ae:
                     _set_provider_issue("airtable", "write_error", str(ae))
                     print(f"Airtable Storage Error: {str(ae)}")
-            _cache_put(session_id, user_id, session_payload)
+            _cache_put(
+                session_id,
+                user_id,
+                session_payload,
+                search_text=search_text,
+                findings_text=_extend_findings_text("", [raw_data.get("description", "")]),
+            )
             
             return ResearchResponse(
                 sessionId=session_id,
@@ -640,22 +1544,21 @@ async def start_research(request: Request, payload: ResearchRequest):
                 tags=[],
                 progress=50,
             )
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             print(f"JSON Decode Error. Raw AI Response: {response.text}")
             raise HTTPException(status_code=500, detail="AI returned invalid data format.")
 
+    except HTTPException:
+        raise
+    except RateLimitError as e:
+        _set_provider_issue("llm", "quota", str(e))
+        raise HTTPException(
+            status_code=429,
+            detail="LLM API quota exhausted. Add billing/key or use fallback mode."
+        )
     except Exception as e:
         import traceback
         traceback.print_exc()
-        
-        # Specific handling for LLM quota issues
-        if "429" in str(e) or "ResourceExhausted" in str(e):
-            _set_provider_issue("llm", "quota", str(e))
-            raise HTTPException(
-                status_code=429, 
-                detail="LLM API quota exhausted. Add billing/key or use fallback mode."
-            )
-            
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/research/history", response_model=List[ResearchResponse])
@@ -664,9 +1567,10 @@ async def get_history(request: Request, category: str = "All", search: str = "")
     user_id = _resolve_user_id(request)
     
     try:
-        items = _build_history_items(user_id, category, search)
+        items = await _build_history_items(user_id, category, search)
         _clear_provider_issue("airtable")
-        return items
+        # Items are built from our own stored payloads; skip FastAPI's validate + jsonable_encoder pass.
+        return ORJSONResponse(content=[item.model_dump() for item in items])
     except Exception as e:
         _set_provider_issue("airtable", "read_error", str(e))
         raise HTTPException(status_code=500, detail=f"Failed to fetch history: {str(e)}")
@@ -685,7 +1589,7 @@ async def get_history_paged(
         safe_page = max(1, page)
         safe_limit = min(max(1, limit), 100)
         fetch_limit = safe_page * safe_limit + 1
-        items = _build_history_items(user_id, category, search, limit=fetch_limit)
+        items = await _build_history_items(user_id, category, search, limit=fetch_limit)
         start = (safe_page - 1) * safe_limit
         end = start + safe_limit
         paged_items = items[start:end]
@@ -710,21 +1614,7 @@ async def get_history_categories(request: Request):
     _require_table()
     user_id = _resolve_user_id(request)
     try:
-        records = _table().all(formula=f"{{User ID}} = '{_escape_formula(user_id)}'", max_records=500)
-        categories: List[str] = []
-        seen = set()
-        for r in records:
-            data = _parse_data_blob(r["fields"])
-            for tag in data.get("tags", []):
-                tag_s = str(tag).strip()
-                if not tag_s:
-                    continue
-                key = tag_s.lower()
-                if key in seen:
-                    continue
-                seen.add(key)
-                categories.append(tag_s)
-        categories.sort()
+        categories = await _build_history_categories(user_id)
         _clear_provider_issue("airtable")
         return categories
     except Exception as e:
@@ -740,24 +1630,24 @@ async def get_session(session_id: str, request: Request):
             cached_data = cast(Dict[str, Any], cached.get("data", {}))
             return SessionDetail(
                 sessionId=session_id,
-                outline=ResearchOutline.model_validate(cached_data.get("outline", {})),
+                outline=_construct_outline(cached_data.get("outline", {})),
                 createdAt=cached.get("created_at"),
-                refinements=[RefinementEntry.model_validate(x) for x in cached_data.get("refinements", [])],
+                refinements=_construct_refinements(cached_data.get("refinements", [])),
                 summary=cached_data.get("summary") or None,
                 tags=cached_data.get("tags", []),
             )
 
         _require_table()
-        record = _find_session_record(session_id, user_id)
+        record = await _find_session_record(session_id, user_id)
         if not record:
             raise HTTPException(status_code=404, detail="Session not found.")
         fields = record["fields"]
-        data = _parse_data_blob(fields)
+        data = _record_data(record)
         return SessionDetail(
             sessionId=fields.get("Session ID") or record.get("id", session_id),
-            outline=ResearchOutline.model_validate(data["outline"]),
+            outline=_construct_outline(data["outline"]),
             createdAt=fields.get("Created Time") or record.get("createdTime"),
-            refinements=[RefinementEntry.model_validate(x) for x in data["refinements"]],
+            refinements=_construct_refinements(data["refinements"]),
             summary=data["summary"] or None,
             tags=data["tags"],
         )
@@ -766,132 +1656,288 @@ async def get_session(session_id: str, request: Request):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch session: {str(e)}")
 
-@app.post("/research/refine", response_model=RefineResponse)
-@limiter.limit("1/5seconds")
+def _current_entry(
+    session_id: str, user_id: str, cached: Optional[Dict[str, Any]], data: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    Re-read the cache entry after an await: a concurrent write to the same session may have replaced it,
+    and its incremental search/findings text must be extended rather than the stale snapshot's.
+    """
+    current = _cache_get(session_id, user_id)
+    if current is not None and current["data"] is data:
+        return current
+    return cached
+
+async def _load_session_for_write(session_id: str, user_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Resolve (cache entry, Airtable record, session data) for a handler that will write the session back.
+    """
+    cached = _cache_get(session_id, user_id)
+    record = _indexed_record_stub(session_id, user_id) if cached else None
+    if not record:
+        record = await _find_session_record(session_id, user_id)
+    if cached:
+        return cached, record, cast(Dict[str, Any], cached["data"])
+    if record:
+        return cached, record, _record_data(record)
+    raise HTTPException(status_code=404, detail="Session not found.")
+
+async def _store_refinement(
+    session_id: str,
+    user_id: str,
+    cached: Optional[Dict[str, Any]],
+    record: Optional[Dict[str, Any]],
+    data: Dict[str, Any],
+    subtopic: str,
+    insight: str,
+) -> None:
+    cached = _current_entry(session_id, user_id, cached, data)
+    data["refinements"].append({"subtopic": subtopic, "insight": insight, "createdAt": _now_iso()})
+
+    outline = data["outline"]
+    search_text = (cached or {}).get("search_text")
+    if search_text is None:
+        search_text = (record or {}).get("fields", {}).get("Search Text") or f"{outline.get('title', '')} {outline.get('description', '')}"
+    search_text = f"{search_text} {subtopic} {insight[:200]}"
+    # Data is only re-sent periodically; the in-process cache holds the live blob in between.
+    unsynced = (cached.get("unsynced_refines", 0) if cached else 0) + 1
+    # The first refinement is persisted right away so history progress reflects it.
+    persist_data = not cached or unsynced >= REFINE_DATA_SYNC_EVERY or len(data["refinements"]) == 1
+
+    cached_created_at = cached.get("created_at") if cached else None
+    _cache_put(
+        session_id,
+        user_id,
+        data,
+        cast(Optional[str], cached_created_at),
+        search_text=search_text,
+        unsynced_refines=0 if persist_data else unsynced,
+        findings_text=_extend_findings_text((cached or {}).get("findings_text"), [insight]),
+    )
+
+    if record:
+        fields: Dict[str, Any] = {
+            "Summary": data.get("summary", ""),
+            "Search Text": search_text,
+            "Status": "Refined",
+        }
+        if persist_data:
+            fields["Data"] = orjson.dumps(data).decode()
+        await _enqueue_record_update(record["id"], fields, session_id, user_id)
+
+@app.post("/research/refine", response_model=RefineResponse, dependencies=[_rate_limit("refine")])
 async def refine_research(request: Request, payload: RefineRequest):
     _require_genai()
     user_id = _resolve_user_id(request)
 
     try:
         cached = _cache_get(payload.sessionId, user_id)
-        record = _find_session_record(payload.sessionId, user_id)
-        if not cached and not record:
-            raise HTTPException(status_code=404, detail="Session not found.")
-
-        if cached:
+        record = _indexed_record_stub(payload.sessionId, user_id) if cached else None
+        if cached and record:
             data = cast(Dict[str, Any], cached["data"])
-        elif record:
-            data = _parse_data_blob(record["fields"])
-        else:
-            raise HTTPException(status_code=404, detail="Session not found.")
-        outline = data["outline"]
-
-        try:
-            response = await _generate_content_with_retry(
-                (
-                    f"{REFINEMENT_PROMPT}\n\n"
-                    f"TOPIC: {outline.get('title', payload.subtopic)}\n"
-                    f"TOPIC DESCRIPTION: {outline.get('description', '')}\n"
-                    f"SELECTED SUBTOPIC: {payload.subtopic}\n"
-                ),
-                max_retries=1,
-                wait_ms=10000,
-                response_json_schema=REFINE_SCHEMA,
+            insight, llm_cached = await _generate_refinement(data["outline"], payload.subtopic)
+        elif cached:
+            data = cast(Dict[str, Any], cached["data"])
+            # The cached outline is enough to prompt the LLM, so overlap the Airtable lookup with it.
+            (insight, llm_cached), record = await asyncio.gather(
+                _generate_refinement(data["outline"], payload.subtopic),
+                _find_session_record(payload.sessionId, user_id),
             )
-            parsed = json.loads(response.text or "{}")
-            insight = str(parsed.get("insight", "")).strip()
-            _clear_provider_issue("llm")
-        except Exception as llm_error:
-            if _is_quota_error(llm_error) and ENABLE_FALLBACK_ON_QUOTA:
-                _set_provider_issue("llm", "quota", str(llm_error))
-                insight = _fallback_refinement(payload.subtopic, outline.get("title", payload.subtopic))
-            elif _is_quota_error(llm_error):
-                _set_provider_issue("llm", "quota", str(llm_error))
-                raise HTTPException(status_code=429, detail="LLM quota exhausted. Cannot generate deep-dive.")
-            else:
-                _set_provider_issue("llm", "error", str(llm_error))
-                raise
+        else:
+            record = await _find_session_record(payload.sessionId, user_id)
+            if not record:
+                raise HTTPException(status_code=404, detail="Session not found.")
+            data = _record_data(record)
+            insight, llm_cached = await _generate_refinement(data["outline"], payload.subtopic)
         if not insight:
             raise HTTPException(status_code=500, detail="AI returned an empty refinement.")
 
-        refinements = data["refinements"]
-        refinements.append({
-            "subtopic": payload.subtopic,
-            "insight": insight,
-            "createdAt": datetime.now(timezone.utc).isoformat(),
-        })
-        data["refinements"] = refinements
+        await _store_refinement(payload.sessionId, user_id, cached, record, data, payload.subtopic, insight)
+        return RefineResponse(sessionId=payload.sessionId, subtopic=payload.subtopic, insight=insight, cached=llm_cached)
+    except HTTPException:
+        raise
+    except RateLimitError as e:
+        _set_provider_issue("llm", "quota", str(e))
+        raise HTTPException(status_code=429, detail="LLM API quota exhausted. Please try again soon.")
+    except Exception as e:
+        _set_provider_issue("airtable", "write_error", str(e))
+        raise HTTPException(status_code=500, detail=f"Failed to refine research: {str(e)}")
+
+@app.post("/research/refine_bulk", response_model=RefineBulkResponse, dependencies=[_rate_limit("refine_bulk")])
+async def refine_research_bulk(request: Request, payload: RefineBulkRequest):
+    _require_genai()
+    user_id = _resolve_user_id(request)
+    # Matching against the model reply is case-insensitive, so dedupe the same way (first spelling wins).
+    subtopics = _dedupe_tags(payload.subtopics)
+    if not subtopics:
+        raise HTTPException(status_code=400, detail="At least one subtopic is required.")
 
+    try:
+        cached = _cache_get(payload.sessionId, user_id)
+        record = _indexed_record_stub(payload.sessionId, user_id) if cached else None
+        if cached and record:
+            data = cast(Dict[str, Any], cached["data"])
+            insights = await _generate_refinements_bulk(data["outline"], subtopics)
+        elif cached:
+            data = cast(Dict[str, Any], cached["data"])
+            insights, record = await asyncio.gather(
+                _generate_refinements_bulk(data["outline"], subtopics),
+                _find_session_record(payload.sessionId, user_id),
+            )
+        else:
+            record = await _find_session_record(payload.sessionId, user_id)
+            if not record:
+                raise HTTPException(status_code=404, detail="Session not found.")
+            data = _record_data(record)
+            insights = await _generate_refinements_bulk(data["outline"], subtopics)
+        outline = data["outline"]
+        if not insights:
+            raise HTTPException(status_code=500, detail="AI returned empty refinements.")
+
+        created_at = _now_iso()
+        new_entries = [
+            {"subtopic": subtopic, "insight": insights[subtopic], "createdAt": created_at}
+            for subtopic in subtopics
+            if subtopic in insights
+        ]
+        data["refinements"].extend(new_entries)
+
+        cached = _current_entry(payload.sessionId, user_id, cached, data)
+        findings = " ".join(f"{x['subtopic']} {x['insight'][:200]}" for x in new_entries)
+        search_text = (cached or {}).get("search_text")
+        if search_text is None:
+            search_text = (record or {}).get("fields", {}).get("Search Text") or f"{outline.get('title', '')} {outline.get('description', '')}"
+        search_text = f"{search_text} {findings}"
         cached_created_at = cached.get("created_at") if cached else None
-        _cache_put(payload.sessionId, user_id, data, cast(Optional[str], cached_created_at))
+        _cache_put(
+            payload.sessionId,
+            user_id,
+            data,
+            cast(Optional[str], cached_created_at),
+            search_text=search_text,
+            findings_text=_extend_findings_text(
+                (cached or {}).get("findings_text"), [x["insight"] for x in new_entries]
+            ),
+        )
 
         if record:
-            _update_record_resilient(
+            await _enqueue_record_update(
                 record["id"],
                 {
-                    "Data": json.dumps(data),
+                    "Data": orjson.dumps(data).decode(),
                     "Summary": data.get("summary", ""),
                     "Tags": ", ".join(data.get("tags", [])),
-                    "Search Text": f"{outline.get('title', '')} {outline.get('description', '')} {payload.subtopic} {insight}",
+                    "Search Text": search_text,
                     "Status": "Refined",
-                }
+                },
+                payload.sessionId,
+                user_id,
             )
-            _clear_provider_issue("airtable")
 
-        return RefineResponse(sessionId=payload.sessionId, subtopic=payload.subtopic, insight=insight)
+        return RefineBulkResponse(
+            sessionId=payload.sessionId,
+            refinements=[RefinementEntry.model_validate(x) for x in new_entries],
+        )
     except HTTPException:
         raise
+    except RateLimitError as e:
+        _set_provider_issue("llm", "quota", str(e))
+        raise HTTPException(status_code=429, detail="LLM API quota exhausted. Please try again soon.")
     except Exception as e:
-        if "429" in str(e) or "ResourceExhausted" in str(e):
-            _set_provider_issue("llm", "quota", str(e))
-            raise HTTPException(status_code=429, detail="LLM API quota exhausted. Please try again soon.")
         _set_provider_issue("airtable", "write_error", str(e))
         raise HTTPException(status_code=500, detail=f"Failed to refine research: {str(e)}")
 
-@app.post("/research/finalize", response_model=FinalizeResponse)
-@limiter.limit("1/5seconds")
-async def finalize_research(request: Request, payload: FinalizeRequest):
+def _resolve_final_tags(outline: Dict[str, Any], tags: List[str], selected: Optional[List[str]]) -> List[str]:
+    """
+    User-selected tags win; otherwise the LLM's tags, falling back to the first subtopic titles.
+    """
+    if not tags:
+        tags = [x.get("title", "") for x in outline.get("subTopics", [])[:5]]
+        tags = [t for t in tags if t]
+
+    selected_tags = [str(t).strip() for t in (selected or []) if str(t).strip()]
+    return _dedupe_tags(selected_tags if selected_tags else tags)
+
+async def _store_finalize(
+    session_id: str,
+    user_id: str,
+    cached: Optional[Dict[str, Any]],
+    record: Optional[Dict[str, Any]],
+    data: Dict[str, Any],
+    findings_text: Optional[str],
+    summary: str,
+    tags: List[str],
+) -> None:
+    """
+    Apply a final summary and tags to the session, cache it and queue the Airtable write.
+    """
+    current = _current_entry(session_id, user_id, cached, data)
+    if current is not cached:
+        # Refinements landed during the LLM call; keep the findings text that includes them.
+        findings_text = cast(Optional[str], current.get("findings_text")) if current else None
+        cached = current
+    outline = data["outline"]
+    data["summary"] = summary
+    data["tags"] = tags
+
+    search_text = f"{outline.get('title', '')} {outline.get('description', '')} {summary} {' '.join(data['tags'])}"
+    cached_created_at = cached.get("created_at") if cached else None
+    _cache_put(
+        session_id,
+        user_id,
+        data,
+        cast(Optional[str], cached_created_at),
+        search_text=search_text,
+        findings_text=findings_text,
+    )
+
+    if record:
+        await _enqueue_record_update(
+            record["id"],
+            {
+                "Data": orjson.dumps(data).decode(),
+                "Summary": summary,
+                "Tags": ", ".join(data["tags"]),
+                "Search Text": search_text,
+                "Status": "Finalized",
+            },
+            session_id,
+            user_id,
+        )
+
+@app.post("/research/finalize", response_model=FinalizeResponse, dependencies=[_rate_limit("finalize")])
+async def finalize_research(request: Request, payload: FinalizeRequest, background_tasks: BackgroundTasks):
     _require_genai()
     user_id = _resolve_user_id(request)
 
     try:
-        cached = _cache_get(payload.sessionId, user_id)
-        record = _find_session_record(payload.sessionId, user_id)
-        if not cached and not record:
-            raise HTTPException(status_code=404, detail="Session not found.")
-
-        if cached:
-            data = cast(Dict[str, Any], cached["data"])
-        elif record:
-            data = _parse_data_blob(record["fields"])
-        else:
-            raise HTTPException(status_code=404, detail="Session not found.")
+        cached, record, data = await _load_session_for_write(payload.sessionId, user_id)
         outline = data["outline"]
         refinements = data["refinements"]
+        findings_text, prompt = _finalize_prompt(outline, refinements, cached)
 
-        findings = [outline.get("description", "")]
-        findings.extend([str(x.get("insight", "")) for x in refinements if x.get("insight")])
-        findings_text = "\n".join([f"- {x}" for x in findings if x])
-
+        llm_cached = False
         try:
-            response = await _generate_content_with_retry(
-                (
-                    f"{FINALIZE_PROMPT}\n\n"
-                    f"TOPIC: {outline.get('title', 'Untitled')}\n"
-                    f"FINDINGS:\n{findings_text}\n"
-                ),
-                max_retries=1,
-                wait_ms=10000,
-                response_json_schema=FINALIZE_SCHEMA,
-            )
-            parsed = json.loads(response.text or "{}")
-            summary = str(parsed.get("summary", "")).strip()
-            tags = [str(t).strip() for t in parsed.get("tags", []) if str(t).strip()]
-            _clear_provider_issue("llm")
+            hit = LLM_CACHE.get(prompt, "finalize")
+            if hit is not None:
+                summary, tags, llm_cached = hit["summary"], list(hit["tags"]), True
+            else:
+                response = await _generate_content_with_retry(
+                    prompt,
+                    max_retries=1,
+                    wait_ms=10000,
+                    response_json_schema=FINALIZE_SCHEMA,
+                )
+                parsed = orjson.loads(response.text or "{}")
+                summary = str(parsed.get("summary", "")).strip()
+                tags = [str(t).strip() for t in parsed.get("tags", []) if str(t).strip()]
+                _clear_provider_issue("llm")
+                if summary:
+                    LLM_CACHE.set(prompt, "finalize", {"summary": summary, "tags": list(tags)})
         except Exception as llm_error:
             if _is_quota_error(llm_error) and ENABLE_FALLBACK_ON_QUOTA:
                 _set_provider_issue("llm", "quota", str(llm_error))
-                parsed = _fallback_finalize(outline, refinements)
+                parsed = _fallback_finalize(outline, findings_text)
                 summary = parsed["summary"]
                 tags = parsed["tags"]
             elif _is_quota_error(llm_error):
@@ -902,138 +1948,370 @@ async def finalize_research(request: Request, payload: FinalizeRequest):
                 raise
         if not summary:
             raise HTTPException(status_code=500, detail="AI returned an empty final summary.")
-        if not tags:
-            tags = [x.get("title", "") for x in outline.get("subTopics", [])[:5]]
-            tags = [t for t in tags if t]
 
-        selected_tags = [str(t).strip() for t in (payload.tags or []) if str(t).strip()]
-        final_tags = selected_tags if selected_tags else tags
+        final_tags = _resolve_final_tags(outline, tags, payload.tags)
+        await _store_finalize(payload.sessionId, user_id, cached, record, data, findings_text, summary, final_tags)
+        if record and AIRTABLE_PDF_FIELD:
+            background_tasks.add_task(_store_session_pdf, payload.sessionId, user_id, record["id"], data)
+        return FinalizeResponse(sessionId=payload.sessionId, summary=summary, tags=final_tags, cached=llm_cached)
+    except HTTPException:
+        raise
+    except RateLimitError as e:
+        _set_provider_issue("llm", "quota", str(e))
+        raise HTTPException(status_code=429, detail="LLM API quota exhausted. Please try again soon.")
+    except Exception as e:
+        _set_provider_issue("airtable", "write_error", str(e))
+        raise HTTPException(status_code=500, detail=f"Failed to finalize research: {str(e)}")
 
-        data["summary"] = summary
-        data["tags"] = list(dict.fromkeys(final_tags))
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+_SSE_DONE = "data: [DONE]\n\n"
 
-        cached_created_at = cached.get("created_at") if cached else None
-        _cache_put(payload.sessionId, user_id, data, cast(Optional[str], cached_created_at))
+@app.post("/research/refine/stream", dependencies=[_rate_limit("refine")])
+async def refine_research_stream(request: Request, payload: RefineRequest):
+    """
+    SSE variant of /research/refine: streams the insight text as `{"delta": ...}` frames, then a `{"result": ...}` frame and `[DONE]`.
+    The session is written back once the response has been sent.
+    """
+    _require_genai()
+    user_id = _resolve_user_id(request)
+    try:
+        cached, record, data = await _load_session_for_write(payload.sessionId, user_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        _set_provider_issue("airtable", "read_error", str(e))
+        raise HTTPException(status_code=500, detail=f"Failed to load research session: {str(e)}")
+    outline = data["outline"]
+    prompt = _refinement_prompt(outline, payload.subtopic)
+    state: Dict[str, Any] = {}
+
+    async def events() -> AsyncIterator[str]:
+        hit = LLM_CACHE.get(prompt, "refine")
+        llm_cached = hit is not None
+        try:
+            if hit is not None:
+                insight = hit["insight"]
+                yield _sse_frame({"delta": insight})
+            else:
+                parts: List[str] = []
+                field = _StreamedField("insight")
+                async for delta in _stream_llm_text(prompt):
+                    parts.append(delta)
+                    if text := field.feed(delta):
+                        yield _sse_frame({"delta": text})
+                insight = str(_parse_streamed_json("".join(parts)).get("insight", "")).strip()
+                _clear_provider_issue("llm")
+                if insight:
+                    LLM_CACHE.set(prompt, "refine", {"insight": insight})
+        except Exception as llm_error:
+            if _is_quota_error(llm_error) and ENABLE_FALLBACK_ON_QUOTA:
+                _set_provider_issue("llm", "quota", str(llm_error))
+                insight = _fallback_refinement(payload.subtopic, outline.get("title", payload.subtopic))
+                yield _sse_frame({"delta": insight})
+            else:
+                _set_provider_issue("llm", "quota" if _is_quota_error(llm_error) else "error", str(llm_error))
+                yield _sse_frame({"error": "Failed to generate deep-dive."})
+                yield _SSE_DONE
+                return
+        if not insight:
+            yield _sse_frame({"error": "AI returned an empty refinement."})
+            yield _SSE_DONE
+            return
+        state["insight"] = insight
+        result = RefineResponse(sessionId=payload.sessionId, subtopic=payload.subtopic, insight=insight, cached=llm_cached)
+        yield _sse_frame({"result": result.model_dump()})
+        yield _SSE_DONE
 
-        if record:
-            _update_record_resilient(
-                record["id"],
-                {
-                    "Data": json.dumps(data),
-                    "Summary": summary,
-                    "Tags": ", ".join(data["tags"]),
-                    "Search Text": f"{outline.get('title', '')} {outline.get('description', '')} {summary} {' '.join(data['tags'])}",
-                    "Status": "Finalized",
-                }
-            )
-            _clear_provider_issue("airtable")
-        return FinalizeResponse(sessionId=payload.sessionId, summary=summary, tags=data["tags"])
+    async def persist() -> None:
+        if "insight" in state:
+            await _store_refinement(payload.sessionId, user_id, cached, record, data, payload.subtopic, state["insight"])
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=_SSE_HEADERS, background=BackgroundTask(persist))
+
+@app.post("/research/finalize/stream", dependencies=[_rate_limit("finalize")])
+async def finalize_research_stream(request: Request, payload: FinalizeRequest):
+    """
+    SSE variant of /research/finalize: streams the summary text as `{"delta": ...}` frames, then a `{"result": ...}` frame and `[DONE]`.
+    The session is written back once the response has been sent.
+    """
+    _require_genai()
+    user_id = _resolve_user_id(request)
+    try:
+        cached, record, data = await _load_session_for_write(payload.sessionId, user_id)
     except HTTPException:
         raise
     except Exception as e:
-        if "429" in str(e) or "ResourceExhausted" in str(e):
-            _set_provider_issue("llm", "quota", str(e))
-            raise HTTPException(status_code=429, detail="LLM API quota exhausted. Please try again soon.")
+        _set_provider_issue("airtable", "read_error", str(e))
+        raise HTTPException(status_code=500, detail=f"Failed to load research session: {str(e)}")
+    outline = data["outline"]
+    refinements = data["refinements"]
+    findings_text, prompt = _finalize_prompt(outline, refinements, cached)
+    state: Dict[str, Any] = {}
+
+    async def events() -> AsyncIterator[str]:
+        hit = LLM_CACHE.get(prompt, "finalize")
+        llm_cached = hit is not None
+        try:
+            if hit is not None:
+                summary, tags = hit["summary"], list(hit["tags"])
+                yield _sse_frame({"delta": summary})
+            else:
+                parts: List[str] = []
+                field = _StreamedField("summary")
+                async for delta in _stream_llm_text(prompt):
+                    parts.append(delta)
+                    if text := field.feed(delta):
+                        yield _sse_frame({"delta": text})
+                parsed = _parse_streamed_json("".join(parts))
+                summary = str(parsed.get("summary", "")).strip()
+                tags = [str(t).strip() for t in parsed.get("tags", []) if str(t).strip()]
+                _clear_provider_issue("llm")
+                if summary:
+                    LLM_CACHE.set(prompt, "finalize", {"summary": summary, "tags": list(tags)})
+        except Exception as llm_error:
+            if _is_quota_error(llm_error) and ENABLE_FALLBACK_ON_QUOTA:
+                _set_provider_issue("llm", "quota", str(llm_error))
+                parsed = _fallback_finalize(outline, findings_text)
+                summary, tags = parsed["summary"], parsed["tags"]
+                yield _sse_frame({"delta": summary})
+            else:
+                _set_provider_issue("llm", "quota" if _is_quota_error(llm_error) else "error", str(llm_error))
+                yield _sse_frame({"error": "Failed to finalize session."})
+                yield _SSE_DONE
+                return
+        if not summary:
+            yield _sse_frame({"error": "AI returned an empty final summary."})
+            yield _SSE_DONE
+            return
+        state["summary"], state["tags"] = summary, _resolve_final_tags(outline, tags, payload.tags)
+        result = FinalizeResponse(sessionId=payload.sessionId, summary=summary, tags=state["tags"], cached=llm_cached)
+        yield _sse_frame({"result": result.model_dump()})
+        yield _SSE_DONE
+
+    async def persist() -> None:
+        if "summary" in state:
+            await _store_finalize(
+                payload.sessionId, user_id, cached, record, data, findings_text, state["summary"], state["tags"]
+            )
+            if record and AIRTABLE_PDF_FIELD:
+                await _store_session_pdf(payload.sessionId, user_id, record["id"], data)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=_SSE_HEADERS, background=BackgroundTask(persist))
+
+_PDF_LINE_CHARS = 110
+_PDF_DISPOSITION = 'attachment; filename="cerebro-{}.pdf"'
+_CSV_EXPORT_HEADERS = {"Content-Disposition": 'attachment; filename="cerebro-history.csv"'}
+
+def _pdf_inputs(data: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]], str, List[str]]:
+    outline = data["outline"]
+    return outline, data["refinements"], data["summary"] or outline.get("description", ""), data["tags"]
+
+def _pdf_fingerprint(refinements: List[Dict[str, Any]], summary: str, tags: List[str]) -> Tuple[int, str, Tuple[str, ...]]:
+    # Refinements are append-only and the outline is fixed, so this identifies the rendered content.
+    return (len(refinements), summary, tuple(tags))
+
+def _pdf_attachment_name(session_id: str, fingerprint: Tuple[int, str, Tuple[str, ...]]) -> str:
+    digest = hashlib.sha1(orjson.dumps(fingerprint)).hexdigest()[:12]
+    return f"cerebro-{session_id}-{digest}.pdf"
+
+async def _store_session_pdf(session_id: str, user_id: str, record_id: str, data: Dict[str, Any]) -> None:
+    """
+    Render a finalized session once and upload it to AIRTABLE_PDF_FIELD so later downloads can redirect to it.
+    """
+    outline, refinements, summary, tags = _pdf_inputs(data)
+    fingerprint = _pdf_fingerprint(refinements, summary, tags)
+    try:
+        pdf_bytes = await run_in_threadpool(_render_session_pdf, session_id, outline, refinements, summary, tags)
+        _PDF_CACHE[(session_id, user_id)] = (fingerprint, pdf_bytes)
+        uploaded = await _table().upload_attachment(
+            record_id, AIRTABLE_PDF_FIELD, _pdf_attachment_name(session_id, fingerprint), pdf_bytes, "application/pdf"
+        )
+        # Uploads append; trim the field back to the new copy so re-finalizing doesn't pile up old PDFs.
+        # The response keys fields by field id, and only carries the attachment field.
+        attachments = next(iter((uploaded.get("fields") or {}).values()), [])
+        if len(attachments) > 1:
+            await _table().update(record_id, {AIRTABLE_PDF_FIELD: [{"id": attachments[-1]["id"]}]})
+        SESSION_RECORD_CACHE.pop((session_id, user_id), None)
+    except Exception as e:
         _set_provider_issue("airtable", "write_error", str(e))
-        raise HTTPException(status_code=500, detail=f"Failed to finalize research: {str(e)}")
+        print(f"Airtable PDF Upload Error: {str(e)}")
+
+def _render_session_pdf(
+    session_id: str,
+    outline: Dict[str, Any],
+    refinements: List[Dict[str, Any]],
+    summary: str,
+    tags: List[str],
+) -> bytes:
+    # reportlab serializes the whole document in one go, so take the bytes directly
+    # instead of saving into a BytesIO and copying them back out.
+    # No output file is ever written: getpdfdata() below returns the bytes.
+    pdf = canvas.Canvas(cast(Any, None))
+    # One text object per page; the font is only re-selected when the size changes.
+    text_obj = pdf.beginText(50, 800)
+    current_size: Optional[int] = None
+
+    def write_line(text: str, size: int = 11):
+        nonlocal text_obj, current_size
+        if text_obj.getY() < 60:
+            pdf.drawText(text_obj)
+            pdf.showPage()
+            text_obj = pdf.beginText(50, 800)
+            current_size = None
+        if size != current_size:
+            text_obj.setFont("Helvetica", size, leading=18)
+            current_size = size
+        text_obj.textLine(text if len(text) <= _PDF_LINE_CHARS else text[:_PDF_LINE_CHARS])
+
+    write_line("Cerebro Research Report", 16)
+    write_line(f"Session ID: {session_id}")
+    write_line(f"Topic: {outline.get('title', 'Untitled')}")
+    write_line("")
+    write_line("Summary:", 12)
+    for chunk in summary.split("\n"):
+        write_line(chunk)
+    write_line("")
+    write_line("Subtopics:", 12)
+    for sub in outline.get("subTopics", []):
+        write_line(f"- {sub.get('title', '')}")
+    if refinements:
+        write_line("")
+        write_line("Refinements:", 12)
+        for ref in refinements:
+            insight = ref.get("insight", "")
+            write_line(f"- {ref.get('subtopic', '')}: {insight if len(insight) <= 90 else insight[:90]}")
+    if tags:
+        write_line("")
+        write_line("Tags:", 12)
+        write_line(", ".join(tags))
+
+    pdf.drawText(text_obj)
+    return pdf.getpdfdata()
 
 @app.get("/research/export/pdf/{session_id}")
 async def export_session_pdf(session_id: str, request: Request):
-    _require_table()
     user_id = _resolve_user_id(request)
 
     try:
-        record = _find_session_record(session_id, user_id)
-        if not record:
-            raise HTTPException(status_code=404, detail="Session not found.")
-        fields = record["fields"]
-        data = _parse_data_blob(fields)
-        outline = data["outline"]
-        refinements = data["refinements"]
-        summary = data["summary"] or outline.get("description", "")
-        tags = data["tags"]
-
-        buffer = BytesIO()
-        pdf = canvas.Canvas(buffer)
-        y = 800
-
-        def write_line(text: str, size: int = 11):
-            nonlocal y
-            if y < 60:
-                pdf.showPage()
-                y = 800
-            pdf.setFont("Helvetica", size)
-            pdf.drawString(50, y, text[:110])
-            y -= 18
-
-        write_line("Cerebro Research Report", 16)
-        write_line(f"Session ID: {session_id}")
-        write_line(f"Topic: {outline.get('title', 'Untitled')}")
-        write_line("")
-        write_line("Summary:", 12)
-        for chunk in summary.split("\n"):
-            write_line(chunk)
-        write_line("")
-        write_line("Subtopics:", 12)
-        for sub in outline.get("subTopics", []):
-            write_line(f"- {sub.get('title', '')}")
-        if refinements:
-            write_line("")
-            write_line("Refinements:", 12)
-            for ref in refinements:
-                write_line(f"- {ref.get('subtopic', '')}: {ref.get('insight', '')[:90]}")
-        if tags:
-            write_line("")
-            write_line("Tags:", 12)
-            write_line(", ".join(tags))
-
-        pdf.save()
-        pdf_bytes = buffer.getvalue()
-        buffer.close()
+        cached = _cache_get(session_id, user_id)
+        record: Optional[Dict[str, Any]] = None
+        if cached:
+            # The cached blob is authoritative while refinements are still waiting to be synced.
+            data = cast(Dict[str, Any], cached["data"])
+        else:
+            _require_table()
+            record = await _find_session_record(session_id, user_id)
+            if not record:
+                raise HTTPException(status_code=404, detail="Session not found.")
+            data = _record_data(record)
+        outline, refinements, summary, tags = _pdf_inputs(data)
+
+        fingerprint = _pdf_fingerprint(refinements, summary, tags)
+        pdf_key = (session_id, user_id)
+        hit = _PDF_CACHE.get(pdf_key)
+        attachments = record["fields"].get(AIRTABLE_PDF_FIELD) if record and AIRTABLE_PDF_FIELD else None
+        if hit is not None and hit[0] == fingerprint:
+            pdf_bytes = hit[1]
+        elif (
+            attachments
+            and record is not None
+            # fetch() callers (the SPA sends a bearer token) would need CORS on Airtable's CDN; only
+            # browser navigations follow the redirect, everyone else gets the bytes from here.
+            and request.headers.get("sec-fetch-mode") == "navigate"
+            and record["fields"].get("Status") == "Finalized"
+            and attachments[-1].get("filename") == _pdf_attachment_name(session_id, fingerprint)
+        ):
+            # The stored copy was rendered from exactly this content; let Airtable's CDN serve it.
+            return RedirectResponse(attachments[-1]["url"])
+        else:
+            # reportlab rendering is CPU-bound; keep it off the event loop.
+            pdf_bytes = await run_in_threadpool(_render_session_pdf, session_id, outline, refinements, summary, tags)
+            _PDF_CACHE[pdf_key] = (fingerprint, pdf_bytes)
 
         return Response(
             content=pdf_bytes,
             media_type="application/pdf",
-            headers={"Content-Disposition": f'attachment; filename="cerebro-{session_id}.pdf"'},
+            headers={"Content-Disposition": _PDF_DISPOSITION.format(session_id)},
         )
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to export PDF: {str(e)}")
 
+class _LineBuffer:
+    """File-like sink for csv.writer that hands back whatever was written since the last drain."""
+
+    def __init__(self):
+        self._parts: List[str] = []
+
+    def write(self, text: str) -> None:
+        self._parts.append(text)
+
+    def drain(self) -> str:
+        text = "".join(self._parts)
+        self._parts.clear()
+        return text
+
 @app.get("/research/export/csv")
 async def export_history_csv(request: Request):
     _require_table()
     user_id = _resolve_user_id(request)
+    cached_csv = _CSV_EXPORT_CACHE.get(user_id)
+    if isinstance(cached_csv, str):
+        return Response(content=cached_csv, media_type="text/csv", headers=_CSV_EXPORT_HEADERS)
     try:
-        records = _table().all(formula=f"{{User ID}} = '{_escape_formula(user_id)}'")
-        buffer = StringIO()
-        writer = csv.writer(buffer)
-        writer.writerow(["sessionId", "createdAt", "title", "description", "subtopics", "summary", "tags"])
-
-        for r in records:
-            fields = r["fields"]
-            data = _parse_data_blob(fields)
-            outline = data["outline"]
-            subtopics = ", ".join([x.get("title", "") for x in outline.get("subTopics", [])])
-            writer.writerow([
-                fields.get("Session ID", "UNKNOWN"),
-                fields.get("Created Time") or r.get("createdTime") or "",
-                outline.get("title", ""),
-                outline.get("description", ""),
-                subtopics,
-                data.get("summary", ""),
-                ", ".join(data.get("tags", [])),
-            ])
-
-        return Response(
-            content=buffer.getvalue(),
-            media_type="text/csv",
-            headers={"Content-Disposition": 'attachment; filename="cerebro-history.csv"'},
-        )
+        pages = _table().iterate(formula=f"{{User ID}} = '{_escape_formula(user_id)}'")
+        # Fetch the first page up front so Airtable errors still surface as a 500 instead of a truncated download.
+        first_page = await anext(pages, None)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to export CSV: {str(e)}")
 
+    # Any write for this user pops the marker, so an export that raced a write is not cached.
+    pending = object()
+    _CSV_EXPORT_CACHE[user_id] = pending
+
+    async def rows():
+        buffer = _LineBuffer()
+        writer = csv.writer(buffer)
+        chunks: Optional[List[str]] = []
+        size = 0
+        writer.writerow(["sessionId", "createdAt", "title", "description", "subtopics", "summary", "tags"])
+        chunk = buffer.drain()
+        chunks.append(chunk)
+        size += len(chunk)
+        yield chunk
+
+        page = first_page
+        while page is not None:
+            for r in page:
+                fields = r["fields"]
+                data = _parse_data_blob(fields)
+                outline = data["outline"]
+                subtopics = ", ".join([x.get("title", "") for x in outline.get("subTopics", [])])
+                writer.writerow([
+                    fields.get("Session ID", "UNKNOWN"),
+                    fields.get("Created Time") or r.get("createdTime") or "",
+                    outline.get("title", ""),
+                    outline.get("description", ""),
+                    subtopics,
+                    data.get("summary", ""),
+                    ", ".join(data.get("tags", [])),
+                ])
+            chunk = buffer.drain()
+            size += len(chunk)
+            if chunks is not None and size > _CSV_EXPORT_CACHE_MAX_CHARS:
+                chunks = None
+                if _CSV_EXPORT_CACHE.get(user_id) is pending:
+                    del _CSV_EXPORT_CACHE[user_id]
+            if chunks is not None:
+                chunks.append(chunk)
+            yield chunk
+            page = await anext(pages, None)
+        if chunks is not None and _CSV_EXPORT_CACHE.get(user_id) is pending:
+            _CSV_EXPORT_CACHE[user_id] = "".join(chunks)
+
+    return StreamingResponse(rows(), media_type="text/csv", headers=_CSV_EXPORT_HEADERS)
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
@@ -1072,10 +2350,70 @@ async def provider_health():
         },
     }
 
-if FRONTEND_DIST.exists():
+@app.get("/admin/cache/stats")
+async def cache_stats():
+    caches = {
+        "session": SESSION_CACHE,
+        "history": HISTORY_CACHE,
+        "sessionRecord": SESSION_RECORD_CACHE,
+        "llm": LLM_CACHE._cache,
+        "pdf": _PDF_CACHE,
+        "csvExport": _CSV_EXPORT_CACHE,
+    }
+    return {
+        name: {"size": len(cache), "maxSize": cache.maxsize, "ttlSeconds": cache.ttl}
+        for name, cache in caches.items()
+    }
+
+# relative path -> (body, gzipped body or None, ETag, media type); built at startup from dist/assets.
+ASSETS: Dict[str, Tuple[bytes, Optional[bytes], str, str]] = {}
+_ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+def _load_assets() -> None:
+    """
+    Read the hashed build assets into memory so /assets never touches the filesystem.
+    """
+    ASSETS.clear()
     assets_dir = FRONTEND_DIST / "assets"
-    if assets_dir.exists():
-        app.mount("/assets", StaticFiles(directory=str(assets_dir)), name="assets")
+    if not assets_dir.is_dir():
+        return
+    for path in assets_dir.rglob("*"):
+        if not path.is_file():
+            continue
+        body = path.read_bytes()
+        compressed = gzip.compress(body, compresslevel=9)
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        ASSETS[path.relative_to(assets_dir).as_posix()] = (
+            body,
+            compressed if len(compressed) < len(body) else None,
+            etag,
+            media_type,
+        )
+
+@functools.lru_cache(maxsize=1024)
+def _resolve_spa(full_path: str) -> str:
+    # dist/ only changes on deploy; lifespan clears this at startup.
+    target = FRONTEND_DIST / full_path
+    if target.exists() and target.is_file():
+        return str(target)
+    return str(FRONTEND_DIST / "index.html")
+
+if FRONTEND_DIST.exists():
+    @app.api_route("/assets/{asset_path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+    async def serve_asset(asset_path: str, request: Request):
+        asset = ASSETS.get(asset_path)
+        if asset is None:
+            raise HTTPException(status_code=404, detail="Not found")
+        body, compressed, etag, media_type = asset
+        headers = {"ETag": etag, "Cache-Control": _ASSET_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+        if_none_match = request.headers.get("if-none-match", "")
+        if if_none_match.strip() == "*" or etag in (t.strip().removeprefix("W/") for t in if_none_match.split(",")):
+            return Response(status_code=304, headers=headers)
+        if compressed is not None and "gzip" in request.headers.get("accept-encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            body = compressed
+        return Response(content=body, media_type=media_type, headers=headers)
 
     @app.get("/", include_in_schema=False)
     async def serve_index():
@@ -1086,10 +2424,7 @@ if FRONTEND_DIST.exists():
         if full_path.startswith("research") or full_path.startswith("health"):
             raise HTTPException(status_code=404, detail="Not found")
 
-        target = FRONTEND_DIST / full_path
-        if target.exists() and target.is_file():
-            return FileResponse(str(target))
-        return FileResponse(str(FRONTEND_DIST / "index.html"))
+        return FileResponse(_resolve_spa(full_path))
 
 if __name__ == "__main__":
     import uvicorn
@@ -30,12 +30,14 @@ export interface RefineResponse {
     sessionId: string;
     subtopic: string;
     insight: string;
+    cached?: boolean;
 }
 
 export interface FinalizeResponse {
     sessionId: string;
     summary: string;
     tags: string[];
+    cached?: boolean;
 }
 
 export interface PagedHistoryResponse {
@@ -212,6 +214,8 @@ export const api = {
         });
     },
 
+    // fetch() never gets the backend's redirect to the Airtable CDN copy (that is for navigations only),
+    // so the PDF bytes always come from our own origin.
     exportSessionPdf: async (sessionId: string): Promise<void> => {
         const response = await fetch(`${API_BASE_URL}/research/export/pdf/${sessionId}`, {
             headers: API_TOKEN ? { Authorization: `Bearer ${API_TOKEN}` } : {},